@@ -2,41 +2,66 @@
 
 from __future__ import annotations
 
-import importlib.metadata
+import sys
 from pathlib import Path
 from typing import Any
 
-import toml
-
-__package_version: str = "unknown"
+__package_version: str | None = None
 
 
 def get_package_version() -> str:
     """Find the version of this package.
 
+    The lookup is done on first use only, so importing the package does
+    not pay for loading the distribution metadata.
+
     Returns:
         str: The version string.
     """
     global __package_version
 
-    if __package_version != "unknown":
+    if __package_version is not None:
         return __package_version
 
     try:
-        # Try to get the version of the current package if
-        # it is running from a distribution.
-        __package_version = importlib.metadata.version("iranleague_exporter")
-    except importlib.metadata.PackageNotFoundError:
-        # Fall back on getting it from a local pyproject.toml.
-        # This works in a development environment where the
-        # package has not been installed from a distribution.
+        # Generated at build time from pyproject.toml (see `make version`)
+        from iranleague_exporter._version import __version__ as version
+    except ImportError:
+        # Fall back on the metadata of the installed distribution. This works
+        # in a development environment where the package is installed in
+        # editable mode but `_version.py` has not been generated.
+        import importlib.metadata
+
+        try:
+            version = importlib.metadata.version("iranleague_exporter")
+        except importlib.metadata.PackageNotFoundError:
+            version = _read_pyproject_version()
+
+    __package_version = version
+    return __package_version
+
+
+def _read_pyproject_version() -> str:
+    """Read the version from a local pyproject.toml.
+
+    This works when running from a source checkout where the package is
+    neither installed nor built with `make version`.
+
+    Returns:
+        str: The version string, or "unknown" if it can't be read.
+    """
+    # tomllib is only in the standard library from Python 3.11 on
+    if sys.version_info >= (3, 11):  # noqa: UP036 - Python 3.10 is still supported
+        import tomllib
+
         pyproject_toml_file: Path = Path(__file__).parent.parent / "pyproject.toml"
-        if pyproject_toml_file.exists() and pyproject_toml_file.is_file():
-            __package_version = toml.load(pyproject_toml_file)["tool"]["poetry"][
-                "version"
-            ]
+        try:
+            with pyproject_toml_file.open("rb") as f:
+                return str(tomllib.load(f)["tool"]["poetry"]["version"])
+        except (OSError, tomllib.TOMLDecodeError, KeyError):
+            pass
 
-    return __package_version
+    return "unknown"
 
 
 def __getattr__(name: str) -> Any:
@@ -51,15 +76,23 @@ def __getattr__(name: str) -> Any:
     Raises:
         AttributeError: If attribute not found.
     """
-    if name in ("version", "__version__"):
+    if name == "version":
         return get_package_version()
 
+    if name == "__version__":
+        value: str = f"v{get_package_version()}"
+        # Cache on the module so later lookups skip this hook
+        globals()[name] = value
+        return value
+
     raise AttributeError(f"No attribute {name} in module {__name__}.")
 
 
 __app_name__ = "iranleague-exporter"
 __description__ = "Export Prometheus metrics for Iran football league"
-__version__ = f"v{get_package_version()}"
+# Resolved on first access by __getattr__. The annotation declares the name
+# for static analysis without binding it, which would bypass the hook
+__version__: str
 
 # Export commonly used items
 __all__: list[str] = [
@@ -3,8 +3,13 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass, field
+import threading
+from dataclasses import dataclass
 from enum import Enum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
 
 
 class LogLevel(str, Enum):
@@ -24,7 +29,12 @@ class Language(str, Enum):
     EN = "EN"
 
 
-@dataclass(frozen=True)
+# Enumeration members by their (upper-case) value, for env var lookups
+_LOG_LEVEL_MAP: dict[str, LogLevel] = {level.value: level for level in LogLevel}
+_LANGUAGE_MAP: dict[str, Language] = {lang.value: lang for lang in Language}
+
+
+@dataclass(frozen=True, slots=True)
 class HTTPConfig:
     """HTTP server configuration."""
 
@@ -33,7 +43,7 @@ class HTTPConfig:
     workers: int = 1
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class CrawlerConfig:
     """Crawler configuration."""
 
@@ -45,7 +55,7 @@ class CrawlerConfig:
     user_agent: str = "IranLeagueExporter/1.0"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AuthConfig:
     """Authentication configuration."""
 
@@ -57,13 +67,19 @@ class AuthConfig:
         return bool(self.username and self.password)
 
 
-@dataclass
+# Frozen, so the default instances can be shared by every AppConfig
+_DEFAULT_HTTP = HTTPConfig()
+_DEFAULT_CRAWLER = CrawlerConfig()
+_DEFAULT_AUTH = AuthConfig()
+
+
+@dataclass(frozen=True, slots=True)
 class AppConfig:
     """Application configuration loaded from environment variables."""
 
-    http: HTTPConfig = field(default_factory=HTTPConfig)
-    crawler: CrawlerConfig = field(default_factory=CrawlerConfig)
-    auth: AuthConfig = field(default_factory=AuthConfig)
+    http: HTTPConfig = _DEFAULT_HTTP
+    crawler: CrawlerConfig = _DEFAULT_CRAWLER
+    auth: AuthConfig = _DEFAULT_AUTH
     log_level: LogLevel = LogLevel.INFO
     label_lang: Language = Language.EN
     update_interval_minutes: int = 30
@@ -83,29 +99,32 @@ class AppConfig:
         Raises:
             ValueError: If required environment variables are missing or invalid.
         """
+        # Read the environment once, every setting then comes from this copy
+        env: dict[str, str] = dict(os.environ)
+
         return cls(
             http=HTTPConfig(
-                host=os.getenv("HTTP_HOST", "0.0.0.0"),
-                port=_get_int_env("HTTP_PORT", 8000),
-                workers=_get_int_env("HTTP_WORKERS", 1),
+                host=env.get("HTTP_HOST", "0.0.0.0"),
+                port=_get_int_env("HTTP_PORT", 8000, env),
+                workers=_get_int_env("HTTP_WORKERS", 1, env),
             ),
             crawler=CrawlerConfig(
-                url=os.getenv(
+                url=env.get(
                     "CRAWLER_URL", "https://iranleague.ir/fa/MatchSchedule/1/1"
                 ),
-                connect_timeout=_get_float_env("CRAWLER_CONNECT_TIMEOUT", 5.0),
-                read_timeout=_get_float_env("CRAWLER_READ_TIMEOUT", 10.0),
-                max_retries=_get_int_env("CRAWLER_MAX_RETRIES", 3),
-                retry_backoff_factor=_get_float_env("CRAWLER_RETRY_BACKOFF", 0.5),
-                user_agent=os.getenv("CRAWLER_USER_AGENT", "IranLeagueExporter/1.0"),
+                connect_timeout=_get_float_env("CRAWLER_CONNECT_TIMEOUT", 5.0, env),
+                read_timeout=_get_float_env("CRAWLER_READ_TIMEOUT", 10.0, env),
+                max_retries=_get_int_env("CRAWLER_MAX_RETRIES", 3, env),
+                retry_backoff_factor=_get_float_env("CRAWLER_RETRY_BACKOFF", 0.5, env),
+                user_agent=env.get("CRAWLER_USER_AGENT", "IranLeagueExporter/1.0"),
             ),
             auth=AuthConfig(
-                username=os.getenv("AUTH_USERNAME", ""),
-                password=os.getenv("AUTH_PASSWORD", ""),
+                username=env.get("AUTH_USERNAME", ""),
+                password=env.get("AUTH_PASSWORD", ""),
             ),
-            log_level=_get_log_level_env("LOG_LEVEL", LogLevel.INFO),
-            label_lang=_get_language_env("LABEL_LANG", Language.EN),
-            update_interval_minutes=_get_int_env("UPDATE_INTERVAL", 30),
+            log_level=_get_log_level_env("LOG_LEVEL", LogLevel.INFO, env),
+            label_lang=_get_language_env("LABEL_LANG", Language.EN, env),
+            update_interval_minutes=_get_int_env("UPDATE_INTERVAL", 30, env),
         )
 
     def validate(self) -> list[str]:
@@ -137,12 +156,13 @@ class AppConfig:
         return errors
 
 
-def _get_int_env(key: str, default: int) -> int:
+def _get_int_env(key: str, default: int, env: Mapping[str, str] | None = None) -> int:
     """Get integer environment variable.
 
     Args:
         key: Environment variable name.
         default: Default value if not set.
+        env: Environment snapshot to read from. Defaults to `os.environ`.
 
     Returns:
         int: Environment variable value or default.
@@ -150,7 +170,7 @@ def _get_int_env(key: str, default: int) -> int:
     Raises:
         ValueError: If value cannot be converted to int.
     """
-    value: str | None = os.getenv(key)
+    value: str | None = (os.environ if env is None else env).get(key)
     if value is None:
         return default
     try:
@@ -159,12 +179,15 @@ def _get_int_env(key: str, default: int) -> int:
         raise ValueError(f"Environment variable '{key}' must be an integer") from e
 
 
-def _get_float_env(key: str, default: float) -> float:
+def _get_float_env(
+    key: str, default: float, env: Mapping[str, str] | None = None
+) -> float:
     """Get float environment variable.
 
     Args:
         key: Environment variable name.
         default: Default value if not set.
+        env: Environment snapshot to read from. Defaults to `os.environ`.
 
     Returns:
         float: Environment variable value or default.
@@ -172,7 +195,7 @@ def _get_float_env(key: str, default: float) -> float:
     Raises:
         ValueError: If value cannot be converted to float.
     """
-    value: str | None = os.getenv(key)
+    value: str | None = (os.environ if env is None else env).get(key)
     if value is None:
         return default
     try:
@@ -181,12 +204,15 @@ def _get_float_env(key: str, default: float) -> float:
         raise ValueError(f"Environment variable '{key}' must be a number") from e
 
 
-def _get_log_level_env(key: str, default: LogLevel) -> LogLevel:
+def _get_log_level_env(
+    key: str, default: LogLevel, env: Mapping[str, str] | None = None
+) -> LogLevel:
     """Get log level environment variable.
 
     Args:
         key: Environment variable name.
         default: Default log level.
+        env: Environment snapshot to read from. Defaults to `os.environ`.
 
     Returns:
         LogLevel: Log level enumeration value.
@@ -194,24 +220,27 @@ def _get_log_level_env(key: str, default: LogLevel) -> LogLevel:
     Raises:
         ValueError: If value is not a valid log level.
     """
-    value: str | None = os.getenv(key)
+    value: str | None = (os.environ if env is None else env).get(key)
     if value is None:
         return default
     try:
-        return LogLevel(value.upper())
-    except ValueError as e:
+        return _LOG_LEVEL_MAP[value.upper()]
+    except KeyError as e:
         valid_levels = ", ".join(level.value for level in LogLevel)
         raise ValueError(
             f"Environment variable '{key}' must be one of: {valid_levels}"
         ) from e
 
 
-def _get_language_env(key: str, default: Language) -> Language:
+def _get_language_env(
+    key: str, default: Language, env: Mapping[str, str] | None = None
+) -> Language:
     """Get language environment variable.
 
     Args:
         key: Environment variable name.
         default: Default language.
+        env: Environment snapshot to read from. Defaults to `os.environ`.
 
     Returns:
         Language: Language enumeration value.
@@ -219,12 +248,12 @@ def _get_language_env(key: str, default: Language) -> Language:
     Raises:
         ValueError: If value is not a valid language.
     """
-    value: str | None = os.getenv(key)
+    value: str | None = (os.environ if env is None else env).get(key)
     if value is None:
         return default
     try:
-        return Language(value.upper())
-    except ValueError as e:
+        return _LANGUAGE_MAP[value.upper()]
+    except KeyError as e:
         valid_langs = ", ".join(lang.value for lang in Language)
         raise ValueError(
             f"Environment variable '{key}' must be one of: {valid_langs}"
@@ -233,21 +262,28 @@ def _get_language_env(key: str, default: Language) -> Language:
 
 # Global configuration instance (loaded lazily)
 _config: AppConfig | None = None
+_config_lock = threading.Lock()
 
 
 def get_config() -> AppConfig:
     """Get the application configuration singleton.
 
+    The configuration is loaded once, under a lock, so concurrent callers
+    never build it twice.
+
     Returns:
         AppConfig: Application configuration instance.
     """
     global _config
     if _config is None:
-        _config = AppConfig.from_env()
+        with _config_lock:
+            if _config is None:
+                _config = AppConfig.from_env()
     return _config
 
 
 def reset_config() -> None:
     """Reset the configuration singleton (useful for testing)."""
     global _config
-    _config = None
+    with _config_lock:
+        _config = None
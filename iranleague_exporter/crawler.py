@@ -2,30 +2,80 @@
 
 from __future__ import annotations
 
+import codecs
+import functools
 import logging
-from datetime import datetime
-from typing import TYPE_CHECKING, Any
+import re
+import threading
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Any, NamedTuple
 
-import jdatetime
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 from requests.adapters import HTTPAdapter
 from slugify import slugify
+from urllib3.util.request import ACCEPT_ENCODING
 from urllib3.util.retry import Retry
 
 from iranleague_exporter.config import CrawlerConfig, Language, get_config
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from lxml.html import HtmlElement
     from requests import Session
 
 log: logging.Logger = logging.getLogger("uvicorn.error")
 
+# Days elapsed in a Jalali year before the first day of each month
+_JALALI_MONTH_OFFSETS: tuple[int, ...] = tuple(
+    31 * month if month <= 6 else 30 * month + 6 for month in range(12)
+)
+
+# Jalali 979/01/01 is 79 days after this Gregorian date
+_GREGORIAN_EPOCH_ORDINAL: int = date(1600, 1, 1).toordinal()
+
+# Persian "YYYY/MM/DD" dates and "HH:MM" times as shown on the schedule
+_DATE_RE = re.compile(r"(\d+)/(\d+)/(\d+)")
+_TIME_RE = re.compile(r"(\d+):(\d+)")
+
+# Opening tag of a table row, in text and in raw response bytes
+_ROW_TAG_RE = re.compile(r"<tr\b", re.IGNORECASE)
+_ROW_TAG_BYTES_RE = re.compile(rb"<tr\b", re.IGNORECASE)
+
+# Charset parameter of a Content-Type header
+_CHARSET_RE = re.compile(r";\s*charset\s*=\s*[\"']?([^\s;\"']+)", re.IGNORECASE)
+
+# Week containers are the divs whose class attribute is exactly "row"
+_WEEKS_XPATH = etree.XPath("//div[@class='row']")
+
+# The second child div of a week holds the games table. Rows with fewer
+# than 7 cells are not match rows, and matches that have already been
+# played show a score instead of "-" (non-breaking spaces count as spaces).
+_MATCH_ROWS_XPATH = etree.XPath(
+    "./div[2]/descendant::table[1]/descendant::tbody[1]//tr[count(td) >= 7]"
+    "[normalize-space(translate(td[2], '\u00a0', ' ')) = '-']"
+)
+
+
+class Match(NamedTuple):
+    """Upcoming match parsed from the schedule."""
+
+    teams: str
+    timestamp: int
+
+
+# Messages for the status codes the schedule server is expected to return
+_HTTP_ERROR_MSGS: dict[int, str] = {
+    code: f"HTTP error: {code}" for code in (403, 404, 429, 500, 502, 503, 504)
+}
+
 
 class CrawlerError(Exception):
     """Custom exception for crawler errors."""
 
-    pass
-
 
 class HTTPError(CrawlerError):
     """HTTP-related errors."""
@@ -38,26 +88,38 @@ class HTTPError(CrawlerError):
             message: Optional error message.
         """
         self.status_code: int = status_code
-        super().__init__(message or f"HTTP error: {status_code}")
+        super().__init__(
+            message or _HTTP_ERROR_MSGS.get(status_code) or f"HTTP error: {status_code}"
+        )
+
+    def __reduce__(self) -> tuple[type[HTTPError], tuple[int, str], dict[str, Any]]:
+        """Pickle with the status code and message as constructor arguments.
+
+        The default reduction would pass the message as the status code.
+
+        Returns:
+            tuple: Class, constructor arguments and instance state.
+        """
+        return type(self), (self.status_code, str(self)), self.__dict__
 
 
 class ParseError(CrawlerError):
     """HTML parsing errors."""
 
-    pass
 
+@functools.cache
+def _build_adapter(config: CrawlerConfig) -> HTTPAdapter:
+    """Build the HTTP adapter with retry configuration.
 
-def _create_session(config: CrawlerConfig) -> Session:
-    """Create a requests session with retry configuration.
+    The crawler configuration is frozen (and so hashable), so the adapter
+    is built once per configuration and shared by every session.
 
     Args:
         config: Crawler configuration.
 
     Returns:
-        Session: Configured requests session.
+        HTTPAdapter: Adapter using the retry strategy.
     """
-    session = requests.Session()
-
     # Configure retry strategy with exponential backoff
     retry_strategy = Retry(
         total=config.max_retries,
@@ -67,7 +129,21 @@ def _create_session(config: CrawlerConfig) -> Session:
         raise_on_status=False,
     )
 
-    adapter = HTTPAdapter(max_retries=retry_strategy)
+    return HTTPAdapter(max_retries=retry_strategy)
+
+
+def _create_session(config: CrawlerConfig) -> Session:
+    """Create a requests session with retry configuration.
+
+    Args:
+        config: Crawler configuration.
+
+    Returns:
+        Session: Configured requests session.
+    """
+    session = requests.Session()
+
+    adapter = _build_adapter(config)
     session.mount("http://", adapter)
     session.mount("https://", adapter)
 
@@ -77,7 +153,8 @@ def _create_session(config: CrawlerConfig) -> Session:
             "User-Agent": config.user_agent,
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
             "Accept-Language": "fa-IR,fa;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Accept-Encoding": "gzip, deflate",
+            # Every encoding urllib3 can decode here (brotli when installed)
+            "Accept-Encoding": ACCEPT_ENCODING,
             "Connection": "keep-alive",
         }
     )
@@ -85,9 +162,103 @@ def _create_session(config: CrawlerConfig) -> Session:
     return session
 
 
+# Shared session, kept open so connections are reused between crawls
+_session: Session | None = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> Session:
+    """Get the shared requests session, creating it on first use.
+
+    The session is created under a lock, so concurrent callers never
+    build two of them.
+
+    Returns:
+        Session: Shared requests session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session(get_config().crawler)
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared requests session (on shutdown and in tests)."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+# Last parsed matches per (language, URL), with the conditional request
+# headers built from the validators (ETag, Last-Modified) of that response
+_cache: dict[tuple[Language, str], tuple[dict[str, str], list[Match]]] = {}
+
+
+def reset_cache() -> None:
+    """Clear the crawl result cache (useful for testing)."""
+    _cache.clear()
+
+
+@functools.lru_cache(maxsize=512)
+def _jalali_to_gregorian(year: int, month: int, day: int) -> tuple[int, int, int]:
+    """Convert a Jalali (Persian) date to a Gregorian date.
+
+    Uses the same arithmetic as FarsiWeb's jalali.c (which `jdatetime` is
+    based on), without building intermediate date objects. Results are
+    cached since a matchday's games share one date but kick off at
+    different times.
+
+    Args:
+        year: Jalali year.
+        month: Jalali month (1-12).
+        day: Jalali day of month.
+
+    Returns:
+        tuple: Gregorian (year, month, day).
+
+    Raises:
+        ValueError: If the Jalali date is invalid.
+    """
+    if not 1 <= month <= 12:
+        raise ValueError(f"Month must be in 1..12, got {month}")
+
+    if month <= 6:
+        month_length = 31
+    elif month < 12:
+        month_length = 30
+    else:
+        # Esfand has 30 days in leap years
+        month_length = 30 if year % 33 in (1, 5, 9, 13, 17, 22, 26, 30) else 29
+
+    if not 1 <= day <= month_length:
+        raise ValueError(f"Day must be in 1..{month_length}, got {day}")
+
+    jy = year - 979
+    day_number = (
+        365 * jy
+        + (jy // 33) * 8
+        + (jy % 33 + 3) // 4
+        + _JALALI_MONTH_OFFSETS[month - 1]
+        + day
+        - 1
+        + 79
+    )
+
+    gregorian_date = date.fromordinal(_GREGORIAN_EPOCH_ORDINAL + day_number)
+    return gregorian_date.year, gregorian_date.month, gregorian_date.day
+
+
+@functools.lru_cache(maxsize=512)
 def _parse_date_time(date_str: str, time_str: str) -> int:
     """Parse Persian date and time to Unix timestamp.
 
+    Results are cached since all matches of a matchday share the same date
+    and most of them the same kick-off time.
+
     Args:
         date_str: Persian date string in format "YYYY/MM/DD".
         time_str: Time string in format "HH:MM".
@@ -98,60 +269,94 @@ def _parse_date_time(date_str: str, time_str: str) -> int:
     Raises:
         ParseError: If date/time cannot be parsed.
     """
+    date_match = _DATE_RE.fullmatch(date_str)
+    if date_match is None:
+        raise ParseError(f"Invalid date format: {date_str}")
+
+    # Default to midnight if time is missing
+    hour: int = 0
+    minute: int = 0
+    if time_str and time_str.strip():
+        time_match = _TIME_RE.fullmatch(time_str.strip())
+        if time_match is None:
+            raise ParseError(f"Invalid time format: {time_str}")
+        hour, minute = int(time_match[1]), int(time_match[2])
+
     try:
-        date_parts: list[int] = list(map(int, date_str.split("/")))
-        if len(date_parts) != 3:
-            raise ParseError(f"Invalid date format: {date_str}")
-
-        gregorian_date = jdatetime.date(
-            year=date_parts[0],
-            month=date_parts[1],
-            day=date_parts[2],
-        ).togregorian()
-
-        # Default to midnight if time is missing
-        if not time_str or time_str.strip() == "":
-            time_str = "00:00"
-
-        datetime_obj: datetime = datetime.strptime(
-            f"{gregorian_date} {time_str}", "%Y-%m-%d %H:%M"
+        if not (0 <= hour < 24 and 0 <= minute < 60):
+            raise ValueError(f"Time out of range: {time_str}")
+
+        year, month, day = _jalali_to_gregorian(
+            int(date_match[1]), int(date_match[2]), int(date_match[3])
         )
-        return int(datetime_obj.timestamp())
 
-    except (ValueError, IndexError) as e:
+        # Kick-off times are wall-clock times in the local zone (set via TZ).
+        # mktime converts the tuple directly, without building a datetime.
+        return int(time.mktime((year, month, day, hour, minute, 0, 0, 0, -1)))
+
+    except (ValueError, OverflowError) as e:
         raise ParseError(f"Failed to parse date/time: {date_str} {time_str}") from e
 
 
-def _parse_match_row(row: Any, lang: Language) -> dict[str, Any] | None:
-    """Parse a single match row from the HTML table.
+@functools.lru_cache(maxsize=256)
+def _slugify_team(name: str) -> str:
+    """Slugify a team name for use in Prometheus labels.
+
+    Team names repeat across the whole schedule, so the (transliterating)
+    slugify call is done once per team rather than once per match.
 
     Args:
-        row: BeautifulSoup row element.
-        lang: Language for team names.
+        name: Team name as shown on the website.
 
     Returns:
-        dict or None: Match data dictionary or None if row should be skipped.
+        str: ASCII slug of the team name.
     """
-    columns = row.find_all("td")
-    if len(columns) < 7:
-        return None
+    return slugify(name, lowercase=False)
 
-    home_team = columns[0].get_text(strip=True)
-    away_team = columns[2].get_text(strip=True)
-    score = columns[1].get_text(strip=True)
 
-    # Skip matches that have already been played
-    if score != "-":
-        return None
+def _join_teams(home_team: str, away_team: str) -> str:
+    """Build the teams label from the original team names."""
+    return f"{home_team} vs {away_team}"
+
+
+def _join_slugified_teams(home_team: str, away_team: str) -> str:
+    """Build the teams label from slugified team names."""
+    return f"{_slugify_team(home_team)} vs {_slugify_team(away_team)}"
+
 
-    teams = f"{home_team} vs {away_team}"
+def _get_teams_formatter(lang: Language) -> Callable[[str, str], str]:
+    """Select the teams label formatter for a language.
 
+    Args:
+        lang: Language for team names.
+
+    Returns:
+        Callable: Function building the label from home and away team names.
+    """
     # Slugify team names for non-Persian languages (better for Prometheus labels)
-    if lang != Language.FA:
-        teams = slugify(teams, lowercase=False).replace("-vs-", " vs ")
+    return _join_teams if lang == Language.FA else _join_slugified_teams
+
+
+def _parse_match_row(
+    row: HtmlElement,
+    format_teams: Callable[[str, str], str],
+) -> Match | None:
+    """Parse a single match row from the HTML table.
 
-    date_str = columns[3].get_text(strip=True)
-    time_str = columns[4].get_text(strip=True)
+    Args:
+        row: Table row of a match not played yet, with at least 7 cells.
+        format_teams: Formatter for the teams label.
+
+    Returns:
+        Match or None: Parsed match or None if row should be skipped.
+    """
+    # Extract the texts of the cells we need (all but the score) in one pass
+    columns = row.findall("td")
+    home_team, away_team, date_str, time_str = [
+        columns[index].text_content().strip() for index in (0, 2, 3, 4)
+    ]
+
+    teams = format_teams(home_team, away_team)
 
     try:
         timestamp: int = _parse_date_time(date_str, time_str)
@@ -159,62 +364,75 @@ def _parse_match_row(row: Any, lang: Language) -> dict[str, Any] | None:
         log.warning("Failed to parse match date/time: %s", e)
         return None
 
-    return {
-        "teams": teams,
-        "timestamp": timestamp,
-    }
+    return Match(teams, timestamp)
 
 
 def get_matches(
-    lang: str | Language,
+    lang: Language,
     url: str | None = None,
     session: Session | None = None,
-) -> list[dict[str, Any]]:
+) -> list[Match]:
     """Crawl the match schedule website and extract future matches.
 
     Args:
-        lang: Language for team names ("FA" or "EN", or Language enum).
+        lang: Language for team names. Callers pass the already validated
+            `AppConfig.label_lang`.
         url: Optional URL override (defaults to config URL).
         session: Optional requests session (for testing).
 
     Returns:
-        list: List of dictionaries with "teams" and "timestamp" keys.
+        list[Match]: Upcoming matches, in page order.
 
     Raises:
+        TypeError: If lang is not a Language member.
         HTTPError: If HTTP request fails.
         CrawlerError: If crawling fails for other reasons.
     """
-    config = get_config().crawler
+    # Strings are no longer normalized per call. "FA" equals Language.FA,
+    # but a case variant such as "fa" would silently get EN labels, so only
+    # Language members are accepted
+    if not isinstance(lang, Language):
+        raise TypeError(f"lang must be a Language, not {type(lang).__name__}")
 
-    # Normalize language to enum
-    if isinstance(lang, str):
-        try:
-            lang = Language(lang.upper())
-        except ValueError:
-            log.warning("Invalid language '%s', defaulting to EN", lang)
-            lang = Language.EN
+    config = get_config().crawler
 
     # Use provided URL or default from config
     target_url: str = url or config.url
 
-    # Create session if not provided
-    own_session: bool = session is None
+    # Reuse the shared session if none is provided
     if session is None:
-        session = _create_session(config)
+        session = _get_session()
+
+    cache_key: tuple[Language, str] = (lang, target_url)
+    cached = _cache.get(cache_key)
 
     try:
         log.debug("Fetching match data from %s", target_url)
 
         response = session.get(
             url=target_url,
+            headers=cached[0] if cached else None,
             timeout=(config.connect_timeout, config.read_timeout),
         )
 
+        # Page has not changed since the last crawl, skip parsing it again
+        if response.status_code == 304 and cached:
+            log.debug("Match data not modified, using cached result")
+            return list(cached[1])
+
         if response.status_code != 200:
             log.error("Failed to fetch data: HTTP %d", response.status_code)
             raise HTTPError(response.status_code)
 
-        return _parse_matches_html(response.text, lang)
+        # Hand the raw bytes to lxml instead of decoding them to str first.
+        # response.encoding is not used: requests reports ISO-8859-1 for any
+        # text/html response without a charset, which would override the
+        # meta charset of the page
+        matches = _parse_matches_html(
+            response.content, lang, _declared_charset(response.headers)
+        )
+        _update_cache(cache_key, response.headers, matches)
+        return matches
 
     except requests.exceptions.Timeout as e:
         log.error("Request timeout while fetching match data")
@@ -228,54 +446,128 @@ def get_matches(
         log.error("Request failed: %s", e)
         raise CrawlerError(f"Request failed: {e}") from e
 
-    finally:
-        if own_session:
-            session.close()
 
+def _declared_charset(headers: Mapping[str, str]) -> str | None:
+    """Get the charset declared by the Content-Type header of a response.
+
+    Args:
+        headers: Response headers.
+
+    Returns:
+        str | None: Declared charset, or None if the header has none or
+            names an encoding Python does not know.
+    """
+    match = _CHARSET_RE.search(headers.get("Content-Type", ""))
+    if match is None:
+        return None
+
+    charset: str = match.group(1)
+    try:
+        codecs.lookup(charset)
+    except LookupError:
+        # Let lxml fall back to the meta charset rather than fail the crawl
+        log.debug("Ignoring unknown charset %r in Content-Type", charset)
+        return None
+    return charset
+
+
+def _update_cache(
+    cache_key: tuple[Language, str],
+    response_headers: Mapping[str, str],
+    matches: list[Match],
+) -> None:
+    """Store parsed matches with the validators of their response.
+
+    Args:
+        cache_key: Language and URL of the crawl.
+        response_headers: Headers of the response the matches were parsed from.
+        matches: Parsed matches.
+    """
+    request_headers: dict[str, str] = {}
+
+    etag = response_headers.get("ETag")
+    if etag:
+        request_headers["If-None-Match"] = etag
+
+    last_modified = response_headers.get("Last-Modified")
+    if last_modified:
+        request_headers["If-Modified-Since"] = last_modified
+
+    if request_headers:
+        _cache[cache_key] = (request_headers, list(matches))
+    else:
+        # Without validators the server can't tell us the page is unchanged
+        _cache.pop(cache_key, None)
 
-def _parse_matches_html(html: str, lang: Language) -> list[dict[str, Any]]:
+
+def _has_table_rows(html: str | bytes) -> bool:
+    """Check whether HTML content contains a table row tag.
+
+    Args:
+        html: HTML content, as a string or as raw response bytes.
+
+    Returns:
+        bool: True if a ``<tr>`` tag appears in the content.
+    """
+    if isinstance(html, bytes):
+        return _ROW_TAG_BYTES_RE.search(html) is not None
+    return _ROW_TAG_RE.search(html) is not None
+
+
+def _parse_matches_html(
+    html: str | bytes,
+    lang: Language,
+    encoding: str | None = None,
+) -> list[Match]:
     """Parse HTML content and extract match data.
 
     Args:
-        html: HTML content string.
+        html: HTML content, as a string or as raw response bytes.
         lang: Language for team names.
+        encoding: Encoding of bytes content. If not set, lxml detects it
+            from the document (e.g. a meta charset tag).
 
     Returns:
-        list: List of match dictionaries.
+        list[Match]: Upcoming matches, in page order.
     """
     if not html or not html.strip():
         log.warning("Received empty HTML content")
         return []
 
-    soup = BeautifulSoup(html, "html.parser")
+    # A page without any table row cannot hold matches, so skip parsing it
+    if not _has_table_rows(html):
+        log.info("Found 0 future matches")
+        return []
 
-    # Find all week rows
-    weeks = soup.select("div.row[class='row']")
-    log.debug("Found %d weeks", len(weeks))
+    parser = lxml.html.HTMLParser(encoding=encoding) if encoding else None
 
-    future_matches: list[dict[str, Any]] = []
+    try:
+        tree = lxml.html.fromstring(html, parser=parser)
+    except etree.ParserError as e:
+        log.warning("Failed to parse HTML content: %s", e)
+        return []
 
-    for week_index, week in enumerate(weeks, start=1):
-        # Find week divs (first is week number, second is games table)
-        divs = week.find_all("div", recursive=False)
-        if len(divs) < 2:
-            continue
+    # The log level does not change while parsing a page
+    debug: bool = log.isEnabledFor(logging.DEBUG)
 
-        games_table = divs[1].find("table")
-        if not games_table:
-            continue
+    # Find all week rows
+    weeks = _WEEKS_XPATH(tree)
+    if debug:
+        log.debug("Found %d weeks", len(weeks))
 
-        tbody = games_table.find("tbody")
-        if not tbody:
-            continue
+    format_teams = _get_teams_formatter(lang)
+    future_matches: list[Match] = []
 
-        rows = tbody.find_all("tr")
-        log.debug("Found %d matches in week %d", len(rows), week_index)
+    for week_index, week in enumerate(weeks, start=1):
+        rows = _MATCH_ROWS_XPATH(week)
+        if debug:
+            log.debug("Found %d matches in week %d", len(rows), week_index)
 
         for row in rows:
-            match = _parse_match_row(row, lang)
+            match = _parse_match_row(row, format_teams)
             if match:
-                log.debug("Processed match: %s", match["teams"])
+                if debug:
+                    log.debug("Processed match: %s", match.teams)
                 future_matches.append(match)
 
     log.info("Found %d future matches", len(future_matches))
@@ -3,13 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import hashlib
+import json
 import logging
 import secrets
 import sys
 import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from datetime import UTC, datetime
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import uvicorn
 from fastapi import Depends, FastAPI, HTTPException, status
@@ -21,11 +26,11 @@ from prometheus_client import (
     Info,
     generate_latest,
 )
-from starlette.responses import JSONResponse, Response
+from starlette.responses import Response
 
 from iranleague_exporter import __version__
-from iranleague_exporter.config import AppConfig, get_config
-from iranleague_exporter.crawler import CrawlerError, get_matches
+from iranleague_exporter.config import AppConfig, AuthConfig, get_config
+from iranleague_exporter.crawler import CrawlerError, close_session, get_matches
 from iranleague_exporter.utils import LogFilter
 
 if TYPE_CHECKING:
@@ -38,6 +43,14 @@ _last_update_success: bool = False
 _last_error: str | None = None
 
 background_tasks: set[asyncio.Task] = set()
+# Updates get their own thread, so they never compete with the threadpool
+# that serves sync endpoints
+_new_crawler_executor = functools.partial(
+    ThreadPoolExecutor, max_workers=1, thread_name_prefix="crawler"
+)
+crawler_executor: ThreadPoolExecutor = _new_crawler_executor()
+# Timer of the next scheduled update
+_update_timer: asyncio.TimerHandle | None = None
 security = HTTPBasic()
 log: logging.Logger = logging.getLogger("uvicorn.error")
 
@@ -77,14 +90,61 @@ matches_count_gauge = Gauge(
 
 metric_lock = threading.Lock()
 
+# Kick-off timestamps currently exported by matches_gauge, keyed by teams
+_current_teams: dict[str, int] = {}
+# Child gauges of matches_gauge, keyed by teams, to skip label lookups
+_gauge_children: dict[str, Gauge] = {}
+
+# Serialized metrics served by /metrics, refreshed whenever metrics change
+_cached_exposition: bytes = generate_latest(registry)
+
+
+@functools.lru_cache(maxsize=1)
+def _auth_credentials(auth: AuthConfig) -> tuple[bytes, bytes]:
+    """Hash the configured credentials once for comparison.
+
+    Args:
+        auth: Authentication configuration.
+
+    Returns:
+        tuple: SHA-256 digests of the username and password.
+    """
+    return _digest(auth.username), _digest(auth.password)
+
+
+def _digest(value: str) -> bytes:
+    """Hash a credential so comparisons always run over 32 bytes.
+
+    Args:
+        value: Credential to hash.
+
+    Returns:
+        bytes: SHA-256 digest of the UTF-8 encoded value.
+    """
+    return hashlib.sha256(value.encode()).digest()
+
+
+async def app_config() -> AppConfig:
+    """Provide the application configuration to request handlers.
+
+    Declared async so FastAPI calls it on the event loop; a sync dependency
+    would be dispatched to the threadpool on every request.
+
+    Returns:
+        AppConfig: Application configuration instance.
+    """
+    return get_config()
+
 
 def verify_credentials(
     credentials: HTTPBasicCredentials = Depends(security),
+    config: AppConfig = Depends(app_config),
 ) -> str:
     """Verify the provided basic-auth credential.
 
     Args:
         credentials: Provided credential.
+        config: Application configuration holding the expected credential.
 
     Returns:
         Username if credentials are valid.
@@ -92,15 +152,15 @@ def verify_credentials(
     Raises:
         HTTPException: If credentials are incorrect.
     """
-    config: AppConfig = get_config()
+    username, password = _auth_credentials(config.auth)
 
     correct_username: bool = secrets.compare_digest(
-        credentials.username,
-        config.auth.username,
+        _digest(credentials.username),
+        username,
     )
     correct_password: bool = secrets.compare_digest(
-        credentials.password,
-        config.auth.password,
+        _digest(credentials.password),
+        password,
     )
 
     if not (correct_username and correct_password):
@@ -113,40 +173,131 @@ def verify_credentials(
     return credentials.username
 
 
+def refresh_exposition() -> None:
+    """Serialize the registry into the cached /metrics response body.
+
+    Called by the thread that just changed the metrics, once it released
+    `metric_lock`. Metrics are thread-safe on their own, so serializing
+    does not need to hold the lock.
+    """
+    global _cached_exposition
+
+    _cached_exposition = generate_latest(registry)
+
+
+def reset_metrics() -> None:
+    """Drop every exported match series (useful for testing)."""
+    global _current_teams
+
+    with metric_lock:
+        matches_gauge.clear()
+        _gauge_children.clear()
+        _current_teams = {}
+        matches_count_gauge.set(0)
+
+    refresh_exposition()
+
+
+def _encode_json(content: dict[str, Any]) -> bytes:
+    """Encode a JSON response body the same way as `JSONResponse`.
+
+    Args:
+        content: JSON-serializable content.
+
+    Returns:
+        bytes: Compact UTF-8 encoded JSON.
+    """
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def refresh_status() -> None:
+    """Rebuild the /health and /ready responses from the update state.
+
+    The state only changes once per update, so probes are answered with
+    these prebuilt bodies instead of encoding JSON on every request.
+    """
+    global _health_response, _ready_response
+
+    last_update: str | None = (
+        _last_update_time.isoformat() if _last_update_time else None
+    )
+    is_healthy: bool = _last_update_success or _last_update_time is None
+    # Ready if we've had at least one successful update
+    is_ready: bool = _last_update_success
+
+    _health_response = (
+        status.HTTP_200_OK if is_healthy else status.HTTP_503_SERVICE_UNAVAILABLE,
+        _encode_json(
+            {
+                "status": "healthy" if is_healthy else "unhealthy",
+                "last_update": last_update,
+                "last_update_success": _last_update_success,
+                "last_error": _last_error,
+                "version": __version__,
+            }
+        ),
+    )
+    _ready_response = (
+        status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        _encode_json({"ready": is_ready, "last_update": last_update}),
+    )
+
+
+# Status code and JSON body of the probe endpoints
+_health_response: tuple[int, bytes]
+_ready_response: tuple[int, bytes]
+refresh_status()
+
+
 def update_metrics() -> None:
     """Fetch match data and update the Prometheus metrics."""
-    global _last_update_time, _last_update_success, _last_error
+    global _last_update_time, _last_update_success, _last_error, _current_teams
 
     config: AppConfig = get_config()
     log.info("Updating metrics")
-    start_time: datetime = datetime.now(UTC)
+    # Monotonic clock for the duration, immune to wall-clock jumps
+    start_time: float = time.perf_counter()
 
     try:
         matches = get_matches(config.label_lang)
         log.debug("Got %d matches", len(matches))
 
+        new_teams: dict[str, int] = {match.teams: match.timestamp for match in matches}
+        count = len(matches)
+
+        # Only the metric mutations are guarded, not fetching or serializing
         with metric_lock:
-            # Clear existing match metrics. We should not accumulate old data
-            matches_gauge.clear()
-            count = 0
-
-            # Update metrics with new data
-            for match in matches:
-                teams = match.get("teams")
-                timestamp = match.get("timestamp")
-                if teams is not None and timestamp is not None:
-                    matches_gauge.labels(teams=teams).set(timestamp)
-                    count += 1
+            # Remove matches that are no longer scheduled. We should not
+            # accumulate old data
+            for teams in _current_teams.keys() - new_teams.keys():
+                matches_gauge.remove(teams)
+                del _gauge_children[teams]
+
+            # Only touch series that are new or whose kick-off time changed
+            for teams, timestamp in new_teams.items():
+                if _current_teams.get(teams) != timestamp:
+                    child = _gauge_children.get(teams)
+                    if child is None:
+                        child = matches_gauge.labels(teams=teams)
+                        _gauge_children[teams] = child
+                    child.set(timestamp)
+
+            _current_teams = new_teams
 
             # Update meta metrics
-            duration: int | float = (datetime.now(UTC) - start_time).total_seconds()
+            duration: float = time.perf_counter() - start_time
             scrape_duration_gauge.set(duration)
             scrape_success_gauge.set(1)
             matches_count_gauge.set(count)
 
-            _last_update_time = datetime.now(UTC)
-            _last_update_success = True
-            _last_error = None
+        _last_update_time = datetime.now(UTC)
+        _last_update_success = True
+        _last_error = None
 
         log.debug("Updated %d metrics in %.2f seconds", count, duration)
 
@@ -154,7 +305,7 @@ def update_metrics() -> None:
         log.error("Crawler error while updating metrics: %s", e)
         with metric_lock:
             scrape_success_gauge.set(0)
-            duration: int | float = (datetime.now(UTC) - start_time).total_seconds()
+            duration: float = time.perf_counter() - start_time
             scrape_duration_gauge.set(duration)
 
         _last_update_time = datetime.now(UTC)
@@ -165,37 +316,84 @@ def update_metrics() -> None:
         log.exception("Unexpected error updating metrics: %s", e)
         with metric_lock:
             scrape_success_gauge.set(0)
-            duration: int | float = (datetime.now(UTC) - start_time).total_seconds()
+            duration: float = time.perf_counter() - start_time
             scrape_duration_gauge.set(duration)
 
         _last_update_time = datetime.now(UTC)
         _last_update_success = False
         _last_error = str(e)
 
+    finally:
+        refresh_exposition()
+        refresh_status()
+
+
+def _schedule_update(
+    loop: asyncio.AbstractEventLoop, deadline: float, interval: int
+) -> None:
+    """Arm the timer for the next metrics update.
+
+    Args:
+        loop: Event loop running the application.
+        deadline: Loop time at which the next update should start.
+        interval: Seconds between updates.
+    """
+    global _update_timer
+
+    if not _shutdown_event.is_set():
+        _update_timer = loop.call_at(deadline, _run_update, loop, deadline, interval)
+
+
+def _run_update(
+    loop: asyncio.AbstractEventLoop, deadline: float, interval: int
+) -> None:
+    """Start a metrics update and re-arm the timer once it finishes.
+
+    The next deadline is derived from this one rather than from the time
+    the update finished, so the update duration does not add up as drift.
+
+    Args:
+        loop: Event loop running the application.
+        deadline: Loop time this update was scheduled for.
+        interval: Seconds between updates.
+    """
+    if _shutdown_event.is_set():
+        return
+
+    def rearm(_: asyncio.Future[None]) -> None:
+        # An update that overran its interval starts the next one right away
+        # instead of firing once for every missed deadline
+        _schedule_update(loop, max(deadline + interval, loop.time()), interval)
+
+    future = loop.run_in_executor(crawler_executor, update_metrics)
+    future.add_done_callback(rearm)
+
+
+def cancel_scheduled_update() -> None:
+    """Cancel the pending metrics update timer, if any."""
+    global _update_timer
+
+    if _update_timer is not None:
+        _update_timer.cancel()
+        _update_timer = None
+
 
 async def periodic_update() -> None:
-    """Periodically update metrics every UPDATE_INTERVAL seconds."""
+    """Periodically update metrics every UPDATE_INTERVAL seconds.
+
+    Runs the initial update, then leaves further updates to a timer that
+    re-arms itself after each update at a fixed cadence.
+    """
     config: AppConfig = get_config()
-    interval: int = config.update_interval_seconds
-
-    # Initial update
-    update_metrics()
-
-    while not _shutdown_event.is_set():
-        try:
-            await asyncio.wait_for(
-                _shutdown_event.wait(),
-                timeout=interval,
-            )
-            # If we get here, shutdown was requested
-            break
-        except TimeoutError:
-            # Timeout means it's time to update
-            update_metrics()
-        except asyncio.CancelledError:
-            # Task was cancelled, exit gracefully
-            log.debug("Periodic update task cancelled")
-            break
+    loop = asyncio.get_running_loop()
+
+    # Initial update. Updates block on the network, so they run in a worker
+    # thread to keep the event loop free to serve requests
+    deadline = loop.time()
+    await loop.run_in_executor(crawler_executor, update_metrics)
+
+    interval = config.update_interval_seconds
+    _schedule_update(loop, max(deadline + interval, loop.time()), interval)
 
 
 @asynccontextmanager
@@ -208,6 +406,8 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     Yields:
         None
     """
+    global crawler_executor
+
     config: AppConfig = get_config()
 
     # Validate configuration
@@ -217,6 +417,12 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
             log.error("Configuration error: %s", error)
         sys.exit(1)
 
+    # Shutdown stops the executor for good, so every startup gets its own.
+    # The one it replaces is idle, so there is nothing to wait for
+    crawler_executor.shutdown(wait=False)
+    crawler_executor = _new_crawler_executor()
+    _shutdown_event.clear()
+
     # Set exporter info
     exporter_info.info(
         {
@@ -225,6 +431,7 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
             "update_interval": str(config.update_interval_minutes),
         }
     )
+    refresh_exposition()
 
     # Start background task
     task = asyncio.create_task(periodic_update())
@@ -242,6 +449,7 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     # Cleanup
     log.info("Shutting down...")
     _shutdown_event.set()
+    cancel_scheduled_update()
 
     # Cancel background tasks
     for task in background_tasks:
@@ -251,6 +459,14 @@ async def lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     if background_tasks:
         await asyncio.gather(*background_tasks, return_exceptions=True)
 
+    # Wait for an in-flight update without blocking the event loop, and
+    # drop any update that has not started yet
+    await asyncio.get_running_loop().run_in_executor(
+        None,
+        functools.partial(crawler_executor.shutdown, wait=True, cancel_futures=True),
+    )
+    close_session()
+
     log.info("Shutdown complete")
 
 
@@ -272,53 +488,46 @@ async def metrics_endpoint(_: str = Depends(verify_credentials)) -> Response:
     Returns:
         HTTP response with Prometheus metrics in text format.
     """
-    with metric_lock:
-        data = generate_latest(registry)
-
-    return Response(content=data, media_type=CONTENT_TYPE_LATEST)
+    # Metrics only change on updates, so serve the bytes serialized then.
+    # Rebinding the module global is atomic, so no lock is needed here.
+    # Served uncompressed: compressing costs both sides more CPU than it
+    # saves on in-cluster scrapes
+    return Response(
+        content=_cached_exposition,
+        media_type=CONTENT_TYPE_LATEST,
+        headers={"Content-Encoding": "identity"},
+    )
 
 
 @app.get("/health")
-async def health_endpoint() -> JSONResponse:
+async def health_endpoint() -> Response:
     """Health check endpoint.
 
     Returns:
         JSON response with health status.
     """
-    is_healthy: bool = _last_update_success or _last_update_time is None
+    status_code, body = _health_response
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK
-        if is_healthy
-        else status.HTTP_503_SERVICE_UNAVAILABLE,
-        content={
-            "status": "healthy" if is_healthy else "unhealthy",
-            "last_update": _last_update_time.isoformat() if _last_update_time else None,
-            "last_update_success": _last_update_success,
-            "last_error": _last_error,
-            "version": __version__,
-        },
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
     )
 
 
 @app.get("/ready")
-async def readiness_endpoint() -> JSONResponse:
+async def readiness_endpoint() -> Response:
     """Readiness check endpoint.
 
     Returns:
         JSON response with readiness status.
     """
-    # Ready if we've had at least one successful update
-    is_ready: bool = _last_update_success
+    status_code, body = _ready_response
 
-    return JSONResponse(
-        status_code=status.HTTP_200_OK
-        if is_ready
-        else status.HTTP_503_SERVICE_UNAVAILABLE,
-        content={
-            "ready": is_ready,
-            "last_update": _last_update_time.isoformat() if _last_update_time else None,
-        },
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
     )
 
 
@@ -333,11 +542,24 @@ def start() -> None:
             print(f"Configuration error: {error}", file=sys.stderr)
         sys.exit(1)
 
+    # Every worker process would run its own crawler against the upstream
+    # site and expose its own registry, so only a single worker is run
+    if config.http.workers > 1:
+        print(
+            f"Warning: HTTP_WORKERS={config.http.workers} is not supported, "
+            "running a single worker",
+            file=sys.stderr,
+        )
+
     uvicorn.run(
-        app="iranleague_exporter.main:app",
+        # Serve the app object directly, so `python -m` runs do not import
+        # this module a second time
+        app=app,
         host=config.http.host,
         port=config.http.port,
-        workers=config.http.workers,
+        workers=1,
+        # Picks uvloop when it is installed (it is not available on Windows)
+        loop="auto",
         log_config={
             "version": 1,
             "disable_existing_loggers": False,
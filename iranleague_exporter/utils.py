@@ -48,11 +48,22 @@ def get_env(key: str, default: str | None = "") -> str | None:
     return value
 
 
+# Paths hit by probes and browsers that would only flood the access log
+_FILTERED_PATHS: tuple[str, ...] = ("/health", "/ready", "/favicon.ico")
+
+
 class LogFilter(logging.Filter):
-    """Filter to exclude health check and favicon from uvicorn access logs."""
+    """Filter to exclude probes and favicon from uvicorn access logs."""
 
     def filter(self, record: logging.LogRecord) -> bool:
         """Return False to exclude the log record."""
-        message = record.getMessage()
-        # Filter out /health and /favicon.ico requests
-        return not any(path in message for path in ["/health", "/favicon.ico"])
+        # uvicorn access records carry (client, method, path, version, status)
+        # as args, so the path can be checked without formatting the message
+        args = record.args
+        if isinstance(args, tuple) and len(args) == 5 and isinstance(args[2], str):
+            target: str = args[2]
+        else:
+            target = record.getMessage()
+
+        # Filter out /health, /ready and /favicon.ico requests
+        return not any(path in target for path in _FILTERED_PATHS)
@@ -0,0 +1,57 @@
+"""Lightweight test doubles for HTTP responses, sessions and credentials."""
+
+from __future__ import annotations
+
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class FakeCredentials(NamedTuple):
+    """HTTP Basic credentials with the attributes the auth check reads."""
+
+    username: str
+    password: str
+
+
+class FakeResponse(NamedTuple):
+    """Response with the attributes the crawler reads."""
+
+    status_code: int
+    content: bytes = b""
+    encoding: str | None = "utf-8"
+    headers: Mapping[str, str] = MappingProxyType(
+        {"Content-Type": "text/html; charset=utf-8"}
+    )
+
+
+class FakeSession:
+    """Session returning canned responses and recording request kwargs."""
+
+    def __init__(self, *responses: FakeResponse) -> None:
+        """Initialize the session.
+
+        Args:
+            *responses: Responses returned by consecutive requests. The last
+                one is repeated once they run out.
+        """
+        self.responses: tuple[FakeResponse, ...] = responses
+        self.headers: dict[str, str] = {}
+        self.adapters: dict[str, Any] = {}
+        self.calls: list[dict[str, Any]] = []
+        self.closed: bool = False
+
+    def mount(self, prefix: str, adapter: Any) -> None:
+        """Record the adapter mounted for a URL prefix."""
+        self.adapters[prefix] = adapter
+
+    def get(self, url: str, **kwargs: Any) -> FakeResponse:
+        """Record the request and return the next canned response."""
+        self.calls.append({"url": url, **kwargs})
+        return self.responses[min(len(self.calls), len(self.responses)) - 1]
+
+    def close(self) -> None:
+        """Mark the session as closed."""
+        self.closed = True
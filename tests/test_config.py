@@ -1,7 +1,9 @@
 """Tests for the config module."""
 
 import os
+import threading
 import unittest
+from dataclasses import FrozenInstanceError
 from unittest.mock import patch
 
 from iranleague_exporter.config import (
@@ -88,14 +90,6 @@ class TestAuthConfig(unittest.TestCase):
 class TestAppConfig(unittest.TestCase):
     """Tests for AppConfig dataclass."""
 
-    def setUp(self):
-        """Reset config before each test."""
-        reset_config()
-
-    def tearDown(self):
-        """Reset config after each test."""
-        reset_config()
-
     @patch.dict(
         os.environ,
         {
@@ -133,6 +127,12 @@ class TestAppConfig(unittest.TestCase):
         config = AppConfig(update_interval_minutes=30)
         self.assertEqual(config.update_interval_seconds, 1800)
 
+    def test_immutable(self):
+        """Test that the loaded configuration can not be modified."""
+        config = AppConfig()
+        with self.assertRaises(FrozenInstanceError):
+            config.update_interval_minutes = 1
+
     @patch.dict(
         os.environ,
         {
@@ -194,6 +194,12 @@ class TestEnvHelpers(unittest.TestCase):
         with self.assertRaises(ValueError):
             _get_int_env("TEST_INT", 0)
 
+    @patch.dict(os.environ, {"TEST_INT": "42"}, clear=True)
+    def test_get_int_env_reads_given_snapshot(self):
+        """Test _get_int_env reads the given snapshot instead of os.environ."""
+        result = _get_int_env("TEST_INT", 0, {"TEST_INT": "7"})
+        self.assertEqual(result, 7)
+
     @patch.dict(os.environ, {"TEST_FLOAT": "3.14"}, clear=True)
     def test_get_float_env(self):
         """Test _get_float_env with valid value."""
@@ -240,12 +246,13 @@ class TestEnvHelpers(unittest.TestCase):
 class TestConfigSingleton(unittest.TestCase):
     """Tests for config singleton behavior."""
 
-    def setUp(self):
-        """Reset config before each test."""
-        reset_config()
+    @classmethod
+    def setUpClass(cls):
+        """Leave no cached config behind once the class has run."""
+        cls.addClassCleanup(reset_config)
 
-    def tearDown(self):
-        """Reset config after each test."""
+    def setUp(self):
+        """Start each test from an empty singleton."""
         reset_config()
 
     @patch.dict(
@@ -262,6 +269,28 @@ class TestConfigSingleton(unittest.TestCase):
         config2 = get_config()
         self.assertIs(config1, config2)
 
+    @patch.dict(
+        os.environ,
+        {
+            "AUTH_USERNAME": "test",
+            "AUTH_PASSWORD": "test",
+        },
+        clear=True,
+    )
+    def test_get_config_concurrent_callers(self):
+        """Test concurrent first calls all get the same instance."""
+        results: list[AppConfig] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_config()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(config) for config in results}), 1)
+
     @patch.dict(
         os.environ,
         {
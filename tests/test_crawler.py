@@ -1,30 +1,49 @@
 """Tests for the crawler module."""
 
+import pickle
+import threading
 import unittest
 from datetime import datetime
 from unittest.mock import Mock, patch
 
 import jdatetime
 
-from iranleague_exporter.config import Language, reset_config
+from iranleague_exporter.config import CrawlerConfig, Language, reset_config
 from iranleague_exporter.crawler import (
     HTTPError,
+    Match,
     ParseError,
+    _build_adapter,
+    _create_session,
+    _get_session,
+    _get_teams_formatter,
+    _jalali_to_gregorian,
     _parse_date_time,
     _parse_matches_html,
+    close_session,
     get_matches,
+    reset_cache,
 )
+from tests._fakes import FakeResponse, FakeSession
 
 
-class TestGetMatches(unittest.TestCase):
+class CrawlerStateTestCase(unittest.TestCase):
+    """Base class for tests that use the config, shared session or cache."""
+
     def setUp(self):
-        """Reset config before each test."""
+        """Reset config, shared session and cache before each test."""
         reset_config()
+        close_session()
+        reset_cache()
 
     def tearDown(self):
-        """Reset config after each test."""
+        """Reset config, shared session and cache after each test."""
         reset_config()
+        close_session()
+        reset_cache()
+
 
+class TestGetMatches(CrawlerStateTestCase):
     @patch("iranleague_exporter.crawler.requests.Session")
     def test_successful_response_with_valid_data(self, mock_session_class):
         """Test a successful response with valid HTML content."""
@@ -62,25 +81,21 @@ class TestGetMatches(unittest.TestCase):
             </body>
         </html>
         """
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = mock_html
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        mock_session_class.return_value = FakeSession(
+            FakeResponse(200, mock_html.encode())
+        )
 
         date = jdatetime.date(day=10, month=10, year=1402).togregorian()
         time = "15:30"
 
-        result = get_matches(lang="EN")
+        result = get_matches(lang=Language.EN)
         expected_result = [
-            {
-                "teams": "Team-A vs Team-B",
-                "timestamp": int(
+            Match(
+                teams="Team-A vs Team-B",
+                timestamp=int(
                     datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M").timestamp()
                 ),
-            }
+            )
         ]
 
         self.assertEqual(result, expected_result)
@@ -112,25 +127,21 @@ class TestGetMatches(unittest.TestCase):
             </body>
         </html>
         """
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = mock_html
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        mock_session_class.return_value = FakeSession(
+            FakeResponse(200, mock_html.encode())
+        )
 
         date = jdatetime.date(day=10, month=10, year=1402).togregorian()
         time = "15:30"
 
-        result = get_matches(lang="FA")
+        result = get_matches(lang=Language.FA)
         expected_result = [
-            {
-                "teams": "تیم اول vs تیم دوم",
-                "timestamp": int(
+            Match(
+                teams="تیم اول vs تیم دوم",
+                timestamp=int(
                     datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M").timestamp()
                 ),
-            }
+            )
         ]
 
         self.assertEqual(result, expected_result)
@@ -138,35 +149,26 @@ class TestGetMatches(unittest.TestCase):
     @patch("iranleague_exporter.crawler.requests.Session")
     def test_non_200_response(self, mock_session_class):
         """Test how the function handles non-200 HTTP responses."""
-        mock_response = Mock()
-        mock_response.status_code = 404
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        mock_session_class.return_value = FakeSession(FakeResponse(404))
 
         with self.assertRaises(HTTPError) as context:
-            get_matches(lang="EN")
+            get_matches(lang=Language.EN)
         self.assertEqual(context.exception.status_code, 404)
 
-    @patch("iranleague_exporter.crawler.requests.Session")
-    def test_empty_html_response(self, mock_session_class):
-        """Test an empty HTML response."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = ""
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        result = get_matches(lang="EN")
-        self.assertEqual(result, [])
-
-    @patch("iranleague_exporter.crawler.requests.Session")
-    def test_malformed_html_structure(self, mock_session_class):
-        """Test how the function handles malformed HTML structure."""
-        mock_html = """
+    def test_http_error_pickles(self):
+        """Test that HTTPError keeps its status code and message when pickled."""
+        for error in (HTTPError(404), HTTPError(418, "I'm a teapot")):
+            with self.subTest(status_code=error.status_code):
+                restored = pickle.loads(pickle.dumps(error))
+                self.assertEqual(restored.status_code, error.status_code)
+                self.assertEqual(str(restored), str(error))
+
+    # Responses that must not yield any future match, as (name, html) pairs
+    NO_MATCH_FIXTURES = (
+        ("empty response", ""),
+        (
+            "malformed structure",
+            """
         <html>
             <body>
                 <div class="row">
@@ -175,22 +177,11 @@ class TestGetMatches(unittest.TestCase):
                 </div>
             </body>
         </html>
-        """
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = mock_html
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        result = get_matches(lang="EN")
-        self.assertEqual(result, [])
-
-    @patch("iranleague_exporter.crawler.requests.Session")
-    def test_rows_with_missing_data(self, mock_session_class):
-        """Test how the function handles rows with missing data."""
-        mock_html = """
+        """,
+        ),
+        (
+            "row with missing data",
+            """
         <html>
             <body>
                 <div class="row">
@@ -212,22 +203,11 @@ class TestGetMatches(unittest.TestCase):
                 </div>
             </body>
         </html>
-        """
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = mock_html
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        result = get_matches(lang="EN")
-        self.assertEqual(result, [])
-
-    @patch("iranleague_exporter.crawler.requests.Session")
-    def test_matches_with_scores(self, mock_session_class):
-        """Test that matches with scores are excluded."""
-        mock_html = """
+        """,
+        ),
+        (
+            "match with score",
+            """
         <html>
             <body>
                 <div class="row">
@@ -250,17 +230,78 @@ class TestGetMatches(unittest.TestCase):
                 </div>
             </body>
         </html>
-        """
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = mock_html
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        result = get_matches(lang="EN")
-        self.assertEqual(result, [])
+        """,
+        ),
+    )
+
+    def test_responses_without_future_matches(self):
+        """Test responses that contain no future matches."""
+        for name, html in self.NO_MATCH_FIXTURES:
+            with self.subTest(name=name):
+                session = FakeSession(FakeResponse(200, html.encode()))
+                result = get_matches(lang=Language.EN, session=session)
+                self.assertEqual(result, [])
+
+    # Spelled with the Arabic yeh so the page also encodes to windows-1256
+    FA_MATCH_HTML = """
+    <html>
+        <head>{meta}</head>
+        <body>
+            <div class="row">
+                <div>Week 1</div>
+                <div>
+                    <table>
+                        <tbody>
+                            <tr>
+                                <td>تيم اول</td><td>-</td><td>تيم دوم</td>
+                                <td>1402/10/10</td><td>15:30</td><td></td><td></td>
+                            </tr>
+                        </tbody>
+                    </table>
+                </div>
+            </div>
+        </body>
+    </html>
+    """
+
+    def test_meta_charset_used_without_header_charset(self):
+        """Test that the meta charset wins over requests' ISO-8859-1 default."""
+        html = self.FA_MATCH_HTML.format(meta='<meta charset="utf-8">')
+        response = FakeResponse(
+            200,
+            html.encode(),
+            encoding="ISO-8859-1",
+            headers={"Content-Type": "text/html"},
+        )
+
+        result = get_matches(lang=Language.FA, session=FakeSession(response))
+        self.assertEqual([m.teams for m in result], ["تيم اول vs تيم دوم"])
+
+    def test_unknown_header_charset_ignored(self):
+        """Test that an unknown header charset falls back to the meta charset."""
+        html = self.FA_MATCH_HTML.format(meta='<meta charset="utf-8">')
+        response = FakeResponse(
+            200,
+            html.encode(),
+            encoding="utf8mb4",
+            headers={"Content-Type": "text/html; charset=utf8mb4"},
+        )
+
+        result = get_matches(lang=Language.FA, session=FakeSession(response))
+        self.assertEqual([m.teams for m in result], ["تيم اول vs تيم دوم"])
+
+    def test_header_charset_used(self):
+        """Test that a charset declared in Content-Type is used."""
+        html = self.FA_MATCH_HTML.format(meta="")
+        response = FakeResponse(
+            200,
+            html.encode("windows-1256"),
+            encoding="windows-1256",
+            headers={"Content-Type": "text/html; charset=windows-1256"},
+        )
+
+        result = get_matches(lang=Language.FA, session=FakeSession(response))
+        self.assertEqual([m.teams for m in result], ["تيم اول vs تيم دوم"])
 
 
 class TestParseDatetime(unittest.TestCase):
@@ -290,6 +331,101 @@ class TestParseDatetime(unittest.TestCase):
         with self.assertRaises(ParseError):
             _parse_date_time("1402/10", "15:30")
 
+    def test_invalid_time_format(self):
+        """Test that invalid time format raises ParseError."""
+        with self.assertRaises(ParseError):
+            _parse_date_time("1402/10/10", "15:30:00")
+
+    def test_out_of_range_time(self):
+        """Test that out of range time raises ParseError."""
+        with self.assertRaises(ParseError):
+            _parse_date_time("1402/10/10", "25:00")
+
+
+class TestConditionalRequests(CrawlerStateTestCase):
+    """Tests for the crawl result cache."""
+
+    mock_html = """
+    <div class="row">
+        <div>Week 1</div>
+        <div>
+            <table>
+                <tbody>
+                    <tr>
+                        <td>Team A</td><td>-</td><td>Team B</td>
+                        <td>1402/10/10</td><td>15:30</td><td></td><td></td>
+                    </tr>
+                </tbody>
+            </table>
+        </div>
+    </div>
+    """
+
+    def _response(self, status_code, headers):
+        """Build a fake response for the schedule page."""
+        return FakeResponse(status_code, self.mock_html.encode(), headers=headers)
+
+    def test_not_modified_returns_cached_matches(self):
+        """Test that a 304 response reuses the previously parsed matches."""
+        session = FakeSession(
+            self._response(200, {"ETag": '"v1"'}),
+            self._response(304, {"ETag": '"v1"'}),
+        )
+
+        first = get_matches(lang=Language.EN, session=session)
+        second = get_matches(lang=Language.EN, session=session)
+
+        self.assertEqual(len(first), 1)
+        self.assertEqual(second, first)
+        self.assertIsNone(session.calls[0]["headers"])
+        self.assertEqual(
+            session.calls[1]["headers"],
+            {"If-None-Match": '"v1"'},
+        )
+
+    def test_without_validators_nothing_is_cached(self):
+        """Test that responses without validators are fetched unconditionally."""
+        session = FakeSession(self._response(200, {}))
+
+        get_matches(lang=Language.EN, session=session)
+        get_matches(lang=Language.EN, session=session)
+
+        self.assertIsNone(session.calls[1]["headers"])
+
+    def test_not_modified_without_cache_raises(self):
+        """Test that an unexpected 304 response is an HTTP error."""
+        session = FakeSession(self._response(304, {}))
+
+        with self.assertRaises(HTTPError) as context:
+            get_matches(lang=Language.EN, session=session)
+        self.assertEqual(context.exception.status_code, 304)
+
+
+class TestJalaliToGregorian(unittest.TestCase):
+    """Tests for the _jalali_to_gregorian function."""
+
+    def test_matches_jdatetime(self):
+        """Test conversion against jdatetime for every day of several years."""
+        for year in range(1395, 1410):
+            for month in range(1, 13):
+                for day in range(1, jdatetime.j_days_in_month[month - 1] + 2):
+                    try:
+                        expected = jdatetime.date(year, month, day).togregorian()
+                    except ValueError:
+                        with self.assertRaises(ValueError):
+                            _jalali_to_gregorian(year, month, day)
+                        continue
+
+                    self.assertEqual(
+                        _jalali_to_gregorian(year, month, day),
+                        (expected.year, expected.month, expected.day),
+                    )
+
+    def test_invalid_month(self):
+        """Test that an invalid month raises ValueError."""
+        with self.assertRaises(ValueError):
+            _jalali_to_gregorian(1402, 13, 1)
+
 
 class TestParseMatchesHtml(unittest.TestCase):
     """Tests for the _parse_matches_html function."""
@@ -310,35 +446,202 @@ class TestParseMatchesHtml(unittest.TestCase):
         result = _parse_matches_html(html, Language.EN)
         self.assertEqual(result, [])
 
+    def test_bytes_html_uses_meta_charset(self):
+        """Test parsing bytes content whose charset is declared in a meta tag."""
+        html = """
+        <html>
+            <head><meta charset="utf-8"></head>
+            <body>
+                <div class="row">
+                    <div>Week 1</div>
+                    <div>
+                        <table>
+                            <tbody>
+                                <tr>
+                                    <td>تیم اول</td><td>-</td><td>تیم دوم</td>
+                                    <td>1402/10/10</td><td>15:30</td><td></td><td></td>
+                                </tr>
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+            </body>
+        </html>
+        """
+        result = _parse_matches_html(html.encode(), Language.FA)
+        self.assertEqual([m.teams for m in result], ["تیم اول vs تیم دوم"])
+
+    def test_only_unplayed_rows_are_parsed(self):
+        """Test that played matches are skipped and padded "-" scores kept."""
+        html = """
+        <div class="row">
+            <div>Week 1</div>
+            <div>
+                <table>
+                    <tbody>
+                        <tr>
+                            <td>Team A</td><td>2 - 1</td><td>Team B</td>
+                            <td>1402/10/10</td><td>15:30</td><td></td><td></td>
+                        </tr>
+                        <tr>
+                            <td>Team C</td><td>&nbsp;-&nbsp;</td><td>Team D</td>
+                            <td>1402/10/10</td><td>18:00</td><td></td><td></td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+        </div>
+        """
+        result = _parse_matches_html(html, Language.EN)
+        self.assertEqual([m.teams for m in result], ["Team-C vs Team-D"])
+
+    def test_uppercase_row_tags_are_parsed(self):
+        """Test that the no-rows fast path does not skip upper-case markup."""
+        html = """
+        <DIV CLASS="row">
+            <DIV>Week 1</DIV>
+            <DIV>
+                <TABLE>
+                    <TBODY>
+                        <TR>
+                            <TD>Team A</TD><TD>-</TD><TD>Team B</TD>
+                            <TD>1402/10/10</TD><TD>15:30</TD><TD></TD><TD></TD>
+                        </TR>
+                    </TBODY>
+                </TABLE>
+            </DIV>
+        </DIV>
+        """
+        for content in (html, html.encode()):
+            with self.subTest(type=type(content).__name__):
+                result = _parse_matches_html(content, Language.EN)
+                self.assertEqual([m.teams for m in result], ["Team-A vs Team-B"])
+
+    def test_comment_only_html(self):
+        """Test HTML that contains no elements."""
+        result = _parse_matches_html("<!-- nothing here -->", Language.EN)
+        self.assertEqual(result, [])
+
+    def test_row_with_extra_classes_is_ignored(self):
+        """Test that only divs with the exact "row" class are weeks."""
+        html = """
+        <div class="row header">
+            <div>Week 1</div>
+            <div>
+                <table>
+                    <tbody>
+                        <tr>
+                            <td>Team A</td><td>-</td><td>Team B</td>
+                            <td>1402/10/10</td><td>15:30</td><td></td><td></td>
+                        </tr>
+                    </tbody>
+                </table>
+            </div>
+        </div>
+        """
+        result = _parse_matches_html(html, Language.EN)
+        self.assertEqual(result, [])
 
-class TestLanguageEnum(unittest.TestCase):
+
+class TestSharedSession(CrawlerStateTestCase):
+    """Tests for the shared requests session."""
+
+    @patch("iranleague_exporter.crawler.requests.Session")
+    def test_session_is_reused(self, mock_session_class):
+        """Test that consecutive crawls share one session."""
+        fake_session = FakeSession(FakeResponse(200, b"<html></html>"))
+        mock_session_class.return_value = fake_session
+
+        get_matches(lang=Language.EN)
+        get_matches(lang=Language.EN)
+
+        mock_session_class.assert_called_once()
+        self.assertEqual(len(fake_session.calls), 2)
+        self.assertFalse(fake_session.closed)
+
+    @patch("iranleague_exporter.crawler.requests.Session")
+    def test_close_session(self, mock_session_class):
+        """Test that close_session closes and drops the shared session."""
+        first = _get_session()
+        close_session()
+        first.close.assert_called_once()
+
+        mock_session_class.return_value = Mock()
+        self.assertIsNot(_get_session(), first)
+
+    @patch("iranleague_exporter.crawler.requests.Session")
+    def test_concurrent_callers_share_session(self, mock_session_class):
+        """Test concurrent first calls all get the same session."""
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(_get_session()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(session) for session in results}), 1)
+        mock_session_class.assert_called_once()
+
+
+class TestCreateSession(unittest.TestCase):
+    """Tests for session creation."""
+
+    def test_adapter_is_shared(self):
+        """Test that sessions with the same config share one adapter."""
+        config = CrawlerConfig(max_retries=5)
+        first = _create_session(config)
+        second = _create_session(config)
+        self.addCleanup(first.close)
+        self.addCleanup(second.close)
+
+        adapter = first.get_adapter("https://iranleague.ir")
+        self.assertIs(adapter, second.get_adapter("https://iranleague.ir"))
+        self.assertIs(adapter, _build_adapter(config))
+        self.assertEqual(adapter.max_retries.total, 5)
+
+    def test_adapter_per_config(self):
+        """Test that a different config gets its own adapter."""
+        self.assertIsNot(
+            _build_adapter(CrawlerConfig(max_retries=1)),
+            _build_adapter(CrawlerConfig(max_retries=2)),
+        )
+
+
+class TestLanguageEnum(CrawlerStateTestCase):
     """Tests for language handling."""
 
     @patch("iranleague_exporter.crawler.requests.Session")
     def test_language_enum_input(self, mock_session_class):
         """Test that Language enum is accepted directly."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = "<html></html>"
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
+        mock_session_class.return_value = FakeSession(
+            FakeResponse(200, b"<html></html>")
+        )
 
         result = get_matches(lang=Language.FA)
         self.assertEqual(result, [])
 
-    @patch("iranleague_exporter.crawler.requests.Session")
-    def test_invalid_language_defaults_to_en(self, mock_session_class):
-        """Test that invalid language defaults to EN."""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.text = "<html></html>"
-
-        mock_session = Mock()
-        mock_session.get.return_value = mock_response
-        mock_session_class.return_value = mock_session
-
-        # Should not raise and should default to EN
-        result = get_matches(lang="INVALID")
-        self.assertEqual(result, [])
+    def test_string_language_rejected(self):
+        """Test that strings are rejected, whatever their case."""
+        session = FakeSession(FakeResponse(200, b"<html></html>"))
+
+        # "fa" used to get EN labels. "FA" equals Language.FA but is still
+        # rejected, so callers can't rely on the canonical case by accident
+        for lang in ("fa", "FA"):
+            with self.subTest(lang=lang), self.assertRaises(TypeError):
+                get_matches(lang=lang, session=session)
+
+        self.assertEqual(session.calls, [])
+
+    def test_teams_formatter_per_language(self):
+        """Test that team names are only slugified for non-FA languages."""
+        self.assertEqual(
+            _get_teams_formatter(Language.FA)("تیم اول", "تیم دوم"),
+            "تیم اول vs تیم دوم",
+        )
+        self.assertEqual(
+            _get_teams_formatter(Language.EN)("Team A", "Team B"),
+            "Team-A vs Team-B",
+        )
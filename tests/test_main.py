@@ -1,64 +1,116 @@
 """Tests for the main module."""
 
+import asyncio
+import inspect
 import os
+import threading
 import unittest
-from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
 
 from fastapi import HTTPException
 from fastapi.testclient import TestClient
 
-from iranleague_exporter.config import reset_config
+from iranleague_exporter.config import AppConfig, AuthConfig, reset_config
+from iranleague_exporter.crawler import CrawlerError, Match
 from iranleague_exporter.main import (
+    _schedule_update,
     app,
+    app_config,
+    cancel_scheduled_update,
     matches_gauge,
+    periodic_update,
+    registry,
+    reset_metrics,
+    start,
     update_metrics,
     verify_credentials,
 )
+from tests._fakes import FakeCredentials
 
 
 class TestMainModule(unittest.TestCase):
+    test_username = "test_user"
+    test_password = "test_pass"
+    config = AppConfig(auth=AuthConfig(test_username, test_password))
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the FastAPI test client and auth environment once."""
+        cls.client = TestClient(app, raise_server_exceptions=False)
+        os.environ["AUTH_USERNAME"] = cls.test_username
+        os.environ["AUTH_PASSWORD"] = cls.test_password
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up the auth environment."""
+        for key in ["AUTH_USERNAME", "AUTH_PASSWORD"]:
+            if key in os.environ:
+                del os.environ[key]
+
     def setUp(self):
-        """Set up the FastAPI test client."""
+        """Reset config and exported matches before each test."""
         reset_config()
-        self.client = TestClient(app, raise_server_exceptions=False)
-        self.test_username = "test_user"
-        self.test_password = "test_pass"
-        os.environ["AUTH_USERNAME"] = self.test_username
-        os.environ["AUTH_PASSWORD"] = self.test_password
+        reset_metrics()
 
     def tearDown(self):
-        """Clean up environment and reset config."""
+        """Reset config after each test."""
         reset_config()
-        for key in ["AUTH_USERNAME", "AUTH_PASSWORD"]:
-            if key in os.environ:
-                del os.environ[key]
 
     def test_verify_credentials_success(self):
         """Test successful verification of credentials."""
-        credentials = MagicMock(
-            username=self.test_username,
-            password=self.test_password,
-        )
+        credentials = FakeCredentials(self.test_username, self.test_password)
 
-        username = verify_credentials(credentials)
+        username = verify_credentials(credentials, self.config)
         self.assertEqual(username, self.test_username)
 
     def test_verify_credentials_failure(self):
         """Test failure of credentials verification."""
-        credentials = MagicMock(username="wrong_user", password="wrong_pass")
+        credentials = FakeCredentials("wrong_user", "wrong_pass")
 
         with self.assertRaises(HTTPException) as context:
-            verify_credentials(credentials)
+            verify_credentials(credentials, self.config)
 
         self.assertEqual(context.exception.status_code, 401)
         self.assertIn("Incorrect username or password", str(context.exception.detail))
 
+    def test_verify_credentials_non_ascii_password(self):
+        """Test that non-ASCII passwords are compared instead of erroring."""
+        config = AppConfig(auth=AuthConfig(self.test_username, "pässwörd"))
+        credentials = FakeCredentials(self.test_username, "pässwörd")
+
+        username = verify_credentials(credentials, config)
+        self.assertEqual(username, self.test_username)
+
+        credentials = FakeCredentials(self.test_username, "passwörd")
+        with self.assertRaises(HTTPException):
+            verify_credentials(credentials, config)
+
+    def test_metrics_endpoint_uses_injected_config(self):
+        """Test that /metrics checks credentials from the config dependency."""
+        config = AppConfig(auth=AuthConfig("other_user", "other_pass"))
+        app.dependency_overrides[app_config] = lambda: config
+        self.addCleanup(app.dependency_overrides.clear)
+
+        response = self.client.get("/metrics", auth=("other_user", "other_pass"))
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(
+            "/metrics",
+            auth=(self.test_username, self.test_password),
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_config_dependency_runs_on_event_loop(self):
+        """Test that the config dependency is async, so it skips the threadpool."""
+        self.assertTrue(inspect.iscoroutinefunction(app_config))
+
     @patch("iranleague_exporter.main.get_matches")
     def test_update_metrics_success(self, mock_get_matches):
         """Test successful update of metrics."""
         mock_get_matches.return_value = [
-            {"week": "1", "teams": "TeamA vs TeamB", "timestamp": 1672531200},
-            {"week": "2", "teams": "TeamC vs TeamD", "timestamp": 1672617600},
+            Match(teams="TeamA vs TeamB", timestamp=1672531200),
+            Match(teams="TeamC vs TeamD", timestamp=1672617600),
         ]
 
         update_metrics()
@@ -69,6 +121,54 @@ class TestMainModule(unittest.TestCase):
         metric = matches_gauge.labels(teams="TeamC vs TeamD")._value.get()
         self.assertEqual(metric, 1672617600)
 
+    @patch("iranleague_exporter.main.get_matches")
+    def test_update_metrics_removes_stale_matches(self, mock_get_matches):
+        """Test that matches missing from a new update are no longer exported."""
+        mock_get_matches.return_value = [
+            Match(teams="TeamG vs TeamH", timestamp=1672531200),
+            Match(teams="TeamI vs TeamJ", timestamp=1672617600),
+        ]
+        update_metrics()
+
+        mock_get_matches.return_value = [
+            Match(teams="TeamI vs TeamJ", timestamp=1672704000),
+        ]
+        update_metrics()
+
+        self.assertIsNone(
+            registry.get_sample_value("ir_league_matches", {"teams": "TeamG vs TeamH"})
+        )
+        self.assertEqual(
+            registry.get_sample_value("ir_league_matches", {"teams": "TeamI vs TeamJ"}),
+            1672704000,
+        )
+
+    @patch("iranleague_exporter.main.get_matches")
+    def test_reset_metrics_drops_match_series(self, mock_get_matches):
+        """Test that reset_metrics removes every exported match."""
+        mock_get_matches.return_value = [
+            Match(teams="TeamK vs TeamL", timestamp=1672531200),
+        ]
+        update_metrics()
+
+        reset_metrics()
+
+        self.assertIsNone(
+            registry.get_sample_value("ir_league_matches", {"teams": "TeamK vs TeamL"})
+        )
+        response = self.client.get(
+            "/metrics",
+            auth=(self.test_username, self.test_password),
+        )
+        self.assertNotIn("TeamK vs TeamL", response.text)
+
+        # A later update exports the same match again
+        update_metrics()
+        self.assertEqual(
+            registry.get_sample_value("ir_league_matches", {"teams": "TeamK vs TeamL"}),
+            1672531200,
+        )
+
     @patch("iranleague_exporter.main.get_matches")
     def test_update_metrics_exception(self, mock_get_matches):
         """Test handling exceptions during metric updates."""
@@ -83,7 +183,7 @@ class TestMainModule(unittest.TestCase):
     def test_metrics_endpoint_authenticated(self, mock_get_matches):
         """Test authenticated access to the /metrics endpoint."""
         mock_get_matches.return_value = [
-            {"teams": "TeamA vs TeamB", "timestamp": 1672531200},
+            Match(teams="TeamA vs TeamB", timestamp=1672531200),
         ]
 
         response = self.client.get(
@@ -93,6 +193,23 @@ class TestMainModule(unittest.TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertIn("ir_league_matches", response.text)
+        self.assertEqual(response.headers["content-encoding"], "identity")
+
+    @patch("iranleague_exporter.main.get_matches")
+    def test_metrics_endpoint_serves_updated_metrics(self, mock_get_matches):
+        """Test that /metrics serves the metrics of the latest update."""
+        mock_get_matches.return_value = [
+            Match(teams="TeamE vs TeamF", timestamp=1672704000),
+        ]
+
+        update_metrics()
+        response = self.client.get(
+            "/metrics",
+            auth=(self.test_username, self.test_password),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('teams="TeamE vs TeamF"', response.text)
 
     def test_metrics_endpoint_unauthorized(self):
         """Test unauthorized access to the /metrics endpoint."""
@@ -107,8 +224,124 @@ class TestMainModule(unittest.TestCase):
         self.assertIn("status", response.json())
         self.assertIn("version", response.json())
 
+    @patch("iranleague_exporter.main.get_matches")
+    def test_health_endpoint_reflects_failed_update(self, mock_get_matches):
+        """Test that /health and /ready report the latest failed update."""
+        mock_get_matches.side_effect = CrawlerError("Mocked crawler error")
+
+        with self.assertLogs("uvicorn.error", level="ERROR"):
+            update_metrics()
+
+        response = self.client.get("/health")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["status"], "unhealthy")
+        self.assertEqual(response.json()["last_error"], "Mocked crawler error")
+
+        response = self.client.get("/ready")
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.json()["ready"])
+
     def test_readiness_endpoint(self):
         """Test the readiness check endpoint."""
         response = self.client.get("/ready")
         self.assertIn(response.status_code, [200, 503])
         self.assertIn("ready", response.json())
+
+    @patch("iranleague_exporter.main.update_metrics")
+    def test_lifespan_runs_twice(self, mock_update_metrics):
+        """Test that the app can start up again after shutting down."""
+        for _ in range(2):
+            updated = threading.Event()
+            mock_update_metrics.side_effect = updated.set
+
+            with TestClient(app):
+                self.assertTrue(updated.wait(timeout=5))
+
+        self.assertEqual(mock_update_metrics.call_count, 2)
+
+
+@patch.dict("os.environ", {"AUTH_USERNAME": "user", "AUTH_PASSWORD": "pass"})
+class TestStart(unittest.TestCase):
+    def setUp(self):
+        """Reset config before each test."""
+        reset_config()
+
+    def tearDown(self):
+        """Reset config after each test."""
+        reset_config()
+
+    @patch.dict("os.environ", {"HTTP_WORKERS": "1"})
+    @patch("iranleague_exporter.main.uvicorn.run")
+    def test_single_worker_serves_app_object(self, mock_run):
+        """Test that a single worker is started with the app object."""
+        start()
+        self.assertIs(mock_run.call_args.kwargs["app"], app)
+
+    @patch.dict("os.environ", {"HTTP_WORKERS": "2"})
+    @patch("iranleague_exporter.main.uvicorn.run")
+    def test_multiple_workers_clamped_to_one(self, mock_run):
+        """Test that more workers are not started, so the crawler runs once."""
+        with patch("sys.stderr"):
+            start()
+        self.assertIs(mock_run.call_args.kwargs["app"], app)
+        self.assertEqual(mock_run.call_args.kwargs["workers"], 1)
+
+
+class TestPeriodicUpdate(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Give each test its own crawler executor."""
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawler")
+        patcher = patch("iranleague_exporter.main.crawler_executor", self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.executor.shutdown)
+
+    async def test_update_runs_off_event_loop_thread(self):
+        """Test that updates run in the crawler thread, not on the event loop."""
+        threads = []
+        shutdown_event = asyncio.Event()
+        shutdown_event.set()
+
+        with (
+            patch(
+                "iranleague_exporter.main.update_metrics",
+                side_effect=lambda: threads.append(threading.current_thread()),
+            ),
+            patch("iranleague_exporter.main._shutdown_event", shutdown_event),
+        ):
+            await periodic_update()
+
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], threading.current_thread())
+        self.assertTrue(threads[0].name.startswith("crawler"))
+
+    async def test_timer_rearms_after_each_update(self):
+        """Test that the update timer re-arms itself until cancelled."""
+        updated = asyncio.Event()
+        calls = []
+        loop = asyncio.get_running_loop()
+
+        def fake_update():
+            calls.append(1)
+            if len(calls) == 2:
+                loop.call_soon_threadsafe(updated.set)
+
+        shutdown_event = asyncio.Event()
+
+        with (
+            patch("iranleague_exporter.main.update_metrics", side_effect=fake_update),
+            patch("iranleague_exporter.main._shutdown_event", shutdown_event),
+        ):
+            _schedule_update(loop, loop.time(), 0)
+            await asyncio.wait_for(updated.wait(), timeout=5)
+
+            # Same order as the lifespan shutdown, so in-flight updates
+            # do not re-arm the timer
+            shutdown_event.set()
+            cancel_scheduled_update()
+
+            # Let an in-flight update and its done callback finish
+            await loop.run_in_executor(self.executor, lambda: None)
+            await asyncio.sleep(0)
+
+        self.assertGreaterEqual(len(calls), 2)
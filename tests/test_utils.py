@@ -1,9 +1,10 @@
 """Tests for the utils module."""
 
+import logging
 import unittest
 from unittest.mock import patch
 
-from iranleague_exporter.utils import get_env
+from iranleague_exporter.utils import LogFilter, get_env
 
 
 class TestGetEnvFunction(unittest.TestCase):
@@ -48,3 +49,41 @@ class TestGetEnvFunction(unittest.TestCase):
         self.assertIn(
             "Environment variable 'TEST_KEY' is not set.", str(context.exception)
         )
+
+
+class TestLogFilter(unittest.TestCase):
+    def _record(self, path):
+        """Build a uvicorn-style access log record for the given path."""
+        return logging.LogRecord(
+            name="uvicorn.access",
+            level=logging.INFO,
+            pathname=__file__,
+            lineno=0,
+            msg='%s - "%s %s HTTP/%s" %d',
+            args=("127.0.0.1:12345", "GET", path, "1.1", 200),
+            exc_info=None,
+        )
+
+    def test_probe_and_favicon_requests_filtered(self):
+        """Test that probe and favicon requests are excluded."""
+        log_filter = LogFilter()
+        for path in ["/health", "/ready", "/favicon.ico"]:
+            with self.subTest(path=path):
+                self.assertFalse(log_filter.filter(self._record(path)))
+
+    def test_metrics_requests_kept(self):
+        """Test that other requests are still logged."""
+        self.assertTrue(LogFilter().filter(self._record("/metrics")))
+
+    def test_unrecognized_record_layout_uses_message(self):
+        """Test that records without access log args are matched on the message."""
+        record = logging.LogRecord(
+            name="uvicorn.access",
+            level=logging.INFO,
+            pathname=__file__,
+            lineno=0,
+            msg="GET /health",
+            args=None,
+            exc_info=None,
+        )
+        self.assertFalse(LogFilter().filter(record))